@@ -23,7 +23,7 @@ DEFAULT_CONFIG_PATH = "/config/config.yaml"
 _DS_STANDARD_KEYS = {"engine", "host", "port", "user", "password", "database"}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Datasource:
     name: str
     engine: str  # "postgres", "mysql", etc.
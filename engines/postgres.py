@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 import re
+import shutil
 import subprocess
 import time
 
@@ -34,6 +35,13 @@ _COMPRESSION_TOOLS: dict[str, tuple[list[str], list[str], str, int]] = {
     "lz4":   (["lz4", "-{level}", "-c"],    ["lz4", "-d", "-c"],  ".lz4", 1),
 }
 
+# Parallel drop-in decompressors, preferred over the tools above when installed.
+# pigz runs reading, writing and CRC checking on separate threads, which keeps
+# gzip decompression from bottlenecking the psql/pg_restore pipeline.
+_PARALLEL_DECOMPRESSORS: dict[str, list[str]] = {
+    "gzip": ["pigz", "-d", "-c"],
+}
+
 _VALID_FORMATS = {"plain", "custom"}
 
 # Extension → (format, compression) mapping for restore detection.
@@ -88,6 +96,19 @@ def _resolve_compression(ds: Datasource) -> tuple[list[str] | None, list[str] |
     return compress_cmd, list(decompress_cmd), ext
 
 
+def _decompress_cmd(compression: str) -> list[str]:
+    """Return the decompressor command for a compression type.
+
+    Uses the parallel implementation from _PARALLEL_DECOMPRESSORS if it is on
+    PATH, otherwise the standard tool from _COMPRESSION_TOOLS.
+    """
+    parallel_cmd = _PARALLEL_DECOMPRESSORS.get(compression)
+    if parallel_cmd is not None and shutil.which(parallel_cmd[0]):
+        return list(parallel_cmd)
+    _, decompress_cmd, _, _ = _COMPRESSION_TOOLS[compression]
+    return list(decompress_cmd)
+
+
 def _detect_from_extension(filename: str) -> tuple[str, str]:
     """Detect (format, compression) from a backup filename extension.
 
@@ -306,8 +327,7 @@ class PostgresEngine(Engine):
             ]
 
         if compression != "none":
-            _, decompress_cmd, _, _ = _COMPRESSION_TOOLS[compression]
-            decompress_cmd = list(decompress_cmd)
+            decompress_cmd = _decompress_cmd(compression)
 
             with open(input_path, "rb") as infile:
                 decompress_proc = subprocess.Popen(
@@ -433,8 +453,7 @@ class PostgresEngine(Engine):
         pg_restore_cmd = [self._pg_bin(ds, "pg_restore"), "--list"]
 
         if compression != "none":
-            _, decompress_cmd, _, _ = _COMPRESSION_TOOLS[compression]
-            decompress_cmd = list(decompress_cmd)
+            decompress_cmd = _decompress_cmd(compression)
 
             with open(file_path, "rb") as infile:
                 decompress_proc = subprocess.Popen(
@@ -474,8 +493,7 @@ class PostgresEngine(Engine):
         sql_markers = ("--", "SET ", "CREATE ", "ALTER ", "INSERT ", "SELECT ", "BEGIN", "COPY ")
 
         if compression != "none":
-            _, decompress_cmd, _, _ = _COMPRESSION_TOOLS[compression]
-            decompress_cmd = list(decompress_cmd)
+            decompress_cmd = _decompress_cmd(compression)
 
             with open(file_path, "rb") as infile:
                 proc = subprocess.Popen(
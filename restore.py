@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import logging
 import os
 import tempfile
@@ -35,13 +36,29 @@ def list_backups(store: Store, prefix: str, dbname: str) -> list[BackupInfo]:
     print(f"{'Timestamp':<22} {'Size':>10}  {'Key'}")
     print("-" * 70)
     for b in backups:
-        ts_str = b.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        ts = b.timestamp
+        # Same output as strftime("%Y-%m-%d %H:%M:%S"), without re-parsing
+        # the format string for every row.
+        ts_str = (f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d} "
+                  f"{ts.hour:02d}:{ts.minute:02d}:{ts.second:02d}")
         print(f"{ts_str:<22} {format_size(b.size):>10}  {b.key}")
 
     print(f"\nTotal: {len(backups)} backup(s)")
     return backups
 
 
+def _fetch_sidecar(store: Store, checksum_key: str) -> str | None:
+    """Read a .sha256 sidecar and return its digest, or None if unavailable.
+
+    Missing or invalid sidecars are non-fatal (older backups don't have one).
+    """
+    try:
+        content = store.get_bytes(checksum_key).decode().strip()
+    except Exception:
+        return None  # sidecar not available — will skip verification
+    return content if len(content) == 64 else None
+
+
 def run_restore(
     ds: Datasource,
     store: Store,
@@ -81,24 +98,20 @@ def run_restore(
     # Download and verify first (before touching the database)
     with tempfile.TemporaryDirectory() as tmpdir:
         local_path = os.path.join(tmpdir, target.filename)
-        store.download(target.key, local_path)
-
-        # Try to verify checksum via .sha256 sidecar.
-        # Download failures or invalid sidecars are non-fatal (backwards compat),
-        # but a genuine checksum mismatch is always fatal.
-        expected_checksum = None
-        try:
-            checksum_path = os.path.join(tmpdir, target.filename + ".sha256")
-            store.download(target.key + ".sha256", checksum_path)
-            with open(checksum_path) as f:
-                content = f.read().strip()
-            if len(content) == 64:
-                expected_checksum = content
-        except Exception:
-            pass  # sidecar not available — will skip verification
+        checksum_key = target.key + ".sha256"
+
+        # Fetch the small .sha256 sidecar in the background while the backup
+        # streams in. Stores that can hash during the download return the
+        # digest; otherwise the file is hashed below, and only if there is a
+        # sidecar to compare against.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            sidecar = executor.submit(_fetch_sidecar, store, checksum_key)
+            actual = store.download_with_hash(target.key, local_path)
+            expected_checksum = sidecar.result()
 
         if expected_checksum is not None:
-            actual = sha256_file(local_path)
+            if actual is None:
+                actual = sha256_file(local_path)
             if actual != expected_checksum:
                 raise RuntimeError(
                     f"Checksum mismatch: expected {expected_checksum}, got {actual}")
@@ -14,7 +14,8 @@ A backup kept by any rule is protected from deletion.
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from operator import attrgetter
 
 from config import RetentionPolicy, build_prefix
 from stores import BackupInfo, Store
@@ -22,21 +23,21 @@ from stores import BackupInfo, Store
 log = logging.getLogger(__name__)
 
 
-def _bucket_key_daily(dt: datetime) -> str:
-    return dt.strftime("%Y-%m-%d")
+def _bucket_key_daily(dt: datetime) -> date:
+    return dt.date()
 
 
-def _bucket_key_weekly(dt: datetime) -> str:
+def _bucket_key_weekly(dt: datetime) -> tuple[int, int]:
     iso = dt.isocalendar()
-    return f"{iso[0]}-W{iso[1]:02d}"
+    return (iso.year, iso.week)
 
 
-def _bucket_key_monthly(dt: datetime) -> str:
-    return dt.strftime("%Y-%m")
+def _bucket_key_monthly(dt: datetime) -> tuple[int, int]:
+    return (dt.year, dt.month)
 
 
-def _bucket_key_yearly(dt: datetime) -> str:
-    return dt.strftime("%Y")
+def _bucket_key_yearly(dt: datetime) -> int:
+    return dt.year
 
 
 def compute_keep_set(
@@ -57,39 +58,42 @@ def compute_keep_set(
 
     keep: set[str] = set()
 
-    if not backups:
+    # Nothing to bucket: no backups, or every rule disabled (zero/negative).
+    if not backups or max(
+        policy.keep_last, policy.keep_daily, policy.keep_weekly,
+        policy.keep_monthly, policy.keep_yearly,
+    ) <= 0:
         return keep
 
     # Newest-first for keep_last
-    sorted_newest = sorted(backups, key=lambda b: b.timestamp, reverse=True)
+    sorted_newest = sorted(backups, key=attrgetter("timestamp"), reverse=True)
 
     # keep_last: always keep the N most recent
     if policy.keep_last > 0:
         for b in sorted_newest[: policy.keep_last]:
             keep.add(b.key)
 
-    # For daily/weekly/monthly/yearly: bucket backups by time period,
-    # then keep the newest backup in each of the most recent N buckets.
-    def _apply_bucket_rule(bucket_fn, count: int) -> None:
-        if count <= 0:
-            return
-
-        buckets: dict[str, BackupInfo] = {}
-        for b in backups:
-            bkey = bucket_fn(b.timestamp)
-            # Keep the newest backup per bucket
-            if bkey not in buckets or b.timestamp > buckets[bkey].timestamp:
-                buckets[bkey] = b
-
-        # Sort bucket keys descending (most recent first) and take N
-        sorted_keys = sorted(buckets.keys(), reverse=True)[:count]
-        for bkey in sorted_keys:
-            keep.add(buckets[bkey].key)
-
-    _apply_bucket_rule(_bucket_key_daily, policy.keep_daily)
-    _apply_bucket_rule(_bucket_key_weekly, policy.keep_weekly)
-    _apply_bucket_rule(_bucket_key_monthly, policy.keep_monthly)
-    _apply_bucket_rule(_bucket_key_yearly, policy.keep_yearly)
+    # For daily/weekly/monthly/yearly: bucket backups by time period in a
+    # single newest-first pass. The first backup seen for a period is its
+    # newest, and periods are first seen newest-first, so each rule keeps the
+    # first N buckets it fills and stops opening new ones after that.
+    rules = [
+        (bucket_fn, count, {})
+        for bucket_fn, count in (
+            (_bucket_key_daily, policy.keep_daily),
+            (_bucket_key_weekly, policy.keep_weekly),
+            (_bucket_key_monthly, policy.keep_monthly),
+            (_bucket_key_yearly, policy.keep_yearly),
+        )
+        if count > 0
+    ]
+    for b in sorted_newest:
+        for bucket_fn, count, buckets in rules:
+            if len(buckets) < count:
+                buckets.setdefault(bucket_fn(b.timestamp), b)
+
+    for _, _, buckets in rules:
+        keep.update(b.key for b in buckets.values())
 
     return keep
 
@@ -133,12 +137,13 @@ def apply_retention(
         if dry_run:
             log.info("Would delete: %s (+ sidecar) (%s)", b.filename, b.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
         else:
-            log.info("Deleting expired backup: %s (%s)", b.filename, b.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
-            store.delete(b.key)
-            try:
-                store.delete(b.key + ".sha256")
-            except Exception:
-                pass  # sidecar may not exist for older backups
+            log.info("Expiring: %s (%s)", b.filename, b.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
+
+    if to_delete and not dry_run:
+        # Each backup is followed by its .sha256 sidecar, which may not exist
+        # for older backups. One batched call lets stores group the deletes.
+        keys = [k for b in to_delete for k in (b.key, b.key + ".sha256")]
+        store.delete_many(keys, allow_missing={b.key + ".sha256" for b in to_delete})
 
     if to_delete:
         if dry_run:
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import importlib
+import os
+import re
+import tempfile
 from abc import ABC, abstractmethod
+from collections.abc import Collection
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
@@ -20,21 +24,25 @@ _BASE_EXTENSIONS = [
 ]
 _ENCRYPTION_SUFFIXES = [".age", ".gpg", ".enc"]
 
-BACKUP_EXTENSIONS = [
-    base + enc
-    for base in _BASE_EXTENSIONS
-    for enc in _ENCRYPTION_SUFFIXES
-] + _BASE_EXTENSIONS
+# A tuple so str.endswith() can test every extension in one C-level call.
+BACKUP_EXTENSIONS = tuple(
+    [base + enc for base in _BASE_EXTENSIONS for enc in _ENCRYPTION_SUFFIXES]
+    + _BASE_EXTENSIONS
+)
 
 
 def is_backup_file(filename: str) -> bool:
     """Return True if *filename* ends with a recognized backup extension."""
-    return any(filename.endswith(ext) for ext in BACKUP_EXTENSIONS)
+    return filename.endswith(BACKUP_EXTENSIONS)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BackupInfo:
-    """Metadata for a single backup file in a store."""
+    """Metadata for a single backup file in a store.
+
+    Slotted and immutable: listings can hold thousands of these, and nothing
+    updates one after the store builds it.
+    """
 
     key: str  # full path/key in the store
     filename: str  # just the filename portion
@@ -42,21 +50,21 @@ class BackupInfo:
     size: int  # bytes
 
 
+# -YYYYMMDD-HHMMSS right before the (optional) backup extension at the end of
+# the name. Compiled once: list() runs this for every object under a prefix.
+_TIMESTAMP_RE = re.compile(
+    r"-([0-9]{4})([0-9]{2})([0-9]{2})-([0-9]{2})([0-9]{2})([0-9]{2})"
+    r"(?:" + "|".join(map(re.escape, BACKUP_EXTENSIONS)) + r")?\Z"
+)
+
+
 def parse_timestamp(filename: str) -> datetime | None:
     """Parse YYYYMMDD-HHMMSS from a backup filename like 'mydb-20260210-143000.sql.gz'."""
-    name = filename
-    for ext in BACKUP_EXTENSIONS:
-        if filename.endswith(ext):
-            name = filename.removesuffix(ext)
-            break
-    parts = name.rsplit("-", 2)
-    if len(parts) < 3:
+    m = _TIMESTAMP_RE.search(filename)
+    if m is None:
         return None
-    date_part, time_part = parts[-2], parts[-1]
     try:
-        return datetime.strptime(f"{date_part}-{time_part}", "%Y%m%d-%H%M%S").replace(
-            tzinfo=timezone.utc
-        )
+        return datetime(*map(int, m.groups()), tzinfo=timezone.utc)
     except ValueError:
         return None
 
@@ -72,6 +80,29 @@ class Store(ABC):
     def download(self, remote_key: str, local_path: str) -> None:
         """Download a file from the store to a local path."""
 
+    def download_with_hash(self, remote_key: str, local_path: str) -> str | None:
+        """Download a file and return the SHA256 hex digest of its contents.
+
+        Returns None if the digest was not computed during the transfer; the
+        caller then hashes the file itself, and only if it needs the digest.
+        The default implementation does this; backends that stream the body
+        should override it to hash each chunk as it is written.
+        """
+        self.download(remote_key, local_path)
+        return None
+
+    def get_bytes(self, remote_key: str) -> bytes:
+        """Return the contents of a small file (e.g. a .sha256 sidecar).
+
+        The default implementation downloads through a temporary file;
+        backends that can read an object body directly should override it.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local_path = os.path.join(tmpdir, os.path.basename(remote_key))
+            self.download(remote_key, local_path)
+            with open(local_path, "rb") as f:
+                return f.read()
+
     @abstractmethod
     def list(self, prefix: str) -> list[BackupInfo]:
         """List backup files under the given prefix, sorted oldest-first."""
@@ -80,6 +111,20 @@ class Store(ABC):
     def delete(self, remote_key: str) -> None:
         """Delete a file from the store."""
 
+    def delete_many(self, keys: list[str], allow_missing: Collection[str] = ()) -> None:
+        """Delete several files from the store.
+
+        Keys in allow_missing are optional: if deleting one fails, the error
+        is ignored. The default implementation deletes one file at a time;
+        backends may override it to delete in batches.
+        """
+        for remote_key in keys:
+            try:
+                self.delete(remote_key)
+            except Exception:
+                if remote_key not in allow_missing:
+                    raise
+
     def close(self) -> None:
         """Release any resources held by the store. No-op by default."""
 
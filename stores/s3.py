@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import os
+from collections.abc import Collection
+from operator import attrgetter
 
 import boto3
 from boto3.s3.transfer import TransferConfig
@@ -15,6 +19,66 @@ from . import BackupInfo, Store, is_backup_file, parse_timestamp
 
 log = logging.getLogger(__name__)
 
+# Multipart part size for S3 transfers. Twice boto3's 8 MiB default halves
+# the request count on multi-GB dumps. Uploads read parts from disk, but
+# download_with_hash writes through a non-seekable _HashingWriter, so
+# s3transfer holds parts that arrive out of order in memory until they can be
+# written in sequence; 16 MiB parts keep that to about max_concurrency x 16 MiB.
+_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+
+# Connection pool size for the shared client. Every store with the same
+# connection settings uses one client, so --parallel jobs, each running
+# max_concurrency transfer threads, draw from one pool; botocore's default of
+# 10 would make them discard connections and pay repeated TLS handshakes.
+# Connections are opened lazily, so a generous cap costs nothing when idle.
+_MAX_POOL_CONNECTIONS = 64
+
+# DeleteObjects accepts at most this many keys per request.
+_DELETE_BATCH_SIZE = 1000
+
+
+class _HashingWriter:
+    """Write-only file wrapper that hashes everything written through it.
+
+    It has no seek/tell, so s3transfer treats it as non-seekable and writes
+    the parts of a concurrent download strictly in order.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self._f.write(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _make_client(endpoint: str | None, access_key: str, secret_key: str, region: str):
+    """Build an S3 client, shared by every store with the same connection.
+
+    Creating a session and client loads botocore's service model, which is
+    slow; `backup --all` builds one store per job, and jobs usually share a
+    bucket. Clients (unlike sessions) are thread-safe, so parallel jobs can
+    share one.
+    """
+    session = boto3.session.Session(
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+    )
+    client_kwargs: dict = {
+        "config": BotoConfig(
+            signature_version="s3v4",
+            retries={"max_attempts": 3, "mode": "standard"},
+            max_pool_connections=_MAX_POOL_CONNECTIONS,
+        ),
+        "region_name": region,
+    }
+    if endpoint:
+        client_kwargs["endpoint_url"] = endpoint
+
+    return session.client("s3", **client_kwargs)
+
 
 class S3Store(Store):
     def __init__(
@@ -26,23 +90,13 @@ class S3Store(Store):
         region: str = "auto",
         max_concurrency: int = 4,
     ):
-        session = boto3.session.Session(
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
-        )
-        client_kwargs: dict = {
-            "config": BotoConfig(
-                signature_version="s3v4",
-                retries={"max_attempts": 3, "mode": "standard"},
-            ),
-            "region_name": region,
-        }
-        if endpoint:
-            client_kwargs["endpoint_url"] = endpoint
-
-        self._client = session.client("s3", **client_kwargs)
+        self._client = _make_client(endpoint, access_key, secret_key, region)
         self._bucket = bucket
-        self._transfer_config = TransferConfig(max_concurrency=max_concurrency)
+        self._transfer_config = TransferConfig(
+            multipart_threshold=_MULTIPART_CHUNKSIZE,
+            multipart_chunksize=_MULTIPART_CHUNKSIZE,
+            max_concurrency=max_concurrency,
+        )
 
     def upload(self, local_path: str, remote_key: str) -> None:
         log.info("Uploading %s -> s3://%s/%s", local_path, self._bucket, remote_key)
@@ -64,6 +118,24 @@ class S3Store(Store):
         )
         self._client.download_file(self._bucket, remote_key, local_path, Config=self._transfer_config)
 
+    def download_with_hash(self, remote_key: str, local_path: str) -> str:
+        log.info(
+            "Downloading s3://%s/%s -> %s", self._bucket, remote_key, local_path
+        )
+        # Hash each chunk as s3transfer writes it, so the checksum doesn't
+        # need a second pass over the downloaded file. The transfer keeps its
+        # concurrency and its retries of interrupted body reads.
+        with open(local_path, "wb") as f:
+            writer = _HashingWriter(f)
+            self._client.download_fileobj(
+                self._bucket, remote_key, writer, Config=self._transfer_config,
+            )
+        return writer.hash.hexdigest()
+
+    def get_bytes(self, remote_key: str) -> bytes:
+        resp = self._client.get_object(Bucket=self._bucket, Key=remote_key)
+        return resp["Body"].read()
+
     def list(self, prefix: str) -> list[BackupInfo]:
         backups: list[BackupInfo] = []
         paginator = self._client.get_paginator("list_objects_v2")
@@ -86,13 +158,29 @@ class S3Store(Store):
                     )
                 )
 
-        backups.sort(key=lambda b: b.timestamp)
+        backups.sort(key=attrgetter("timestamp"))
         return backups
 
     def delete(self, remote_key: str) -> None:
         log.info("Deleting s3://%s/%s", self._bucket, remote_key)
         self._client.delete_object(Bucket=self._bucket, Key=remote_key)
 
+    def delete_many(self, keys: list[str], allow_missing: Collection[str] = ()) -> None:
+        # One DeleteObjects request per 1000 keys instead of a round trip per
+        # key. S3 treats deleting a missing key as success; any other per-key
+        # failure is reported in the response's Errors list.
+        for i in range(0, len(keys), _DELETE_BATCH_SIZE):
+            batch = keys[i:i + _DELETE_BATCH_SIZE]
+            log.info("Deleting %d object(s) from s3://%s", len(batch), self._bucket)
+            resp = self._client.delete_objects(
+                Bucket=self._bucket,
+                Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+            )
+            errors = [e for e in resp.get("Errors", []) if e.get("Key") not in allow_missing]
+            if errors:
+                details = ", ".join(f"{e.get('Key')}: {e.get('Message', e.get('Code'))}" for e in errors)
+                raise RuntimeError(f"Failed to delete {len(errors)} object(s): {details}")
+
 
 def create(config: dict) -> S3Store:
     if "bucket" not in config:
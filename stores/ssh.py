@@ -8,6 +8,8 @@ import shlex
 import shutil
 import subprocess
 import tempfile
+from collections.abc import Collection
+from operator import attrgetter
 
 from config import ConfigError
 
@@ -15,6 +17,9 @@ from . import BACKUP_EXTENSIONS, BackupInfo, Store, parse_timestamp
 
 log = logging.getLogger(__name__)
 
+# Paths per rm -f command, to stay well under the remote ARG_MAX.
+_RM_BATCH_SIZE = 500
+
 
 class SSHStore(Store):
     def __init__(
@@ -32,6 +37,10 @@ class SSHStore(Store):
         self._key_file = key_file
         self._control_dir = tempfile.mkdtemp(prefix="dbbackup-ssh-")
         self._control_path = os.path.join(self._control_dir, "ctrl-%h-%p-%r")
+        # Nothing the options depend on changes after this point, so build
+        # them once instead of on every command.
+        self._ssh_opts_cache = tuple(self._connect_opts("-p"))
+        self._scp_opts_cache = tuple(self._connect_opts("-P"))
 
     def _connect_opts(self, port_flag: str) -> list[str]:
         """Build common SSH/SCP options. port_flag is '-p' for ssh, '-P' for scp."""
@@ -48,11 +57,11 @@ class SSHStore(Store):
             opts.extend(["-i", self._key_file])
         return opts
 
-    def _ssh_opts(self) -> list[str]:
-        return self._connect_opts("-p")
+    def _ssh_opts(self) -> tuple[str, ...]:
+        return self._ssh_opts_cache
 
-    def _scp_opts(self) -> list[str]:
-        return self._connect_opts("-P")
+    def _scp_opts(self) -> tuple[str, ...]:
+        return self._scp_opts_cache
 
     def _ssh_dest(self) -> str:
         return f"{self._user}@{self._host}"
@@ -125,13 +134,11 @@ class SSHStore(Store):
         result = self._run(cmd)
 
         backups: list[BackupInfo] = []
-        for line in result.stdout.strip().splitlines():
-            if not line.strip():
-                continue
-            parts = line.split("\t", 1)
-            if len(parts) != 2:
+        for line in result.stdout.splitlines():
+            # Blank and malformed lines have no tab and are skipped.
+            size_str, sep, full_path = line.partition("\t")
+            if not sep:
                 continue
-            size_str, full_path = parts
             # key is relative to base_path
             key = full_path.removeprefix(self._base_path).lstrip("/")
             filename = os.path.basename(full_path)
@@ -147,13 +154,31 @@ class SSHStore(Store):
                 )
             )
 
-        backups.sort(key=lambda b: b.timestamp)
+        backups.sort(key=attrgetter("timestamp"))
         return backups
 
     def delete(self, remote_key: str) -> None:
         remote_path = f"{self._base_path}/{remote_key}"
         log.info("Deleting %s:%s", self._host, remote_path)
-        self._run(["ssh", *self._ssh_opts(), self._ssh_dest(), f"rm -f {shlex.quote(remote_path)}"])
+        self._run(["ssh", *self._ssh_opts(), self._ssh_dest(), f"rm -f -- {shlex.quote(remote_path)}"])
+
+    def delete_many(self, keys: list[str], allow_missing: Collection[str] = ()) -> None:
+        # rm -f ignores missing files, so keys go out in as few commands as
+        # possible. Optional keys (e.g. .sha256 sidecars) get their own
+        # commands, so a failure on one of them (say, permissions) doesn't
+        # abort deleting the rest.
+        self._rm_many([k for k in keys if k not in allow_missing])
+        try:
+            self._rm_many([k for k in keys if k in allow_missing])
+        except RuntimeError as exc:
+            log.warning("Failed to delete optional file(s) from %s: %s", self._host, exc)
+
+    def _rm_many(self, keys: list[str]) -> None:
+        for i in range(0, len(keys), _RM_BATCH_SIZE):
+            batch = keys[i:i + _RM_BATCH_SIZE]
+            log.info("Deleting %d file(s) from %s", len(batch), self._host)
+            paths = " ".join(shlex.quote(f"{self._base_path}/{k}") for k in batch)
+            self._run(["ssh", *self._ssh_opts(), self._ssh_dest(), f"rm -f -- {paths}"])
 
 
 def create(config: dict) -> SSHStore:
@@ -99,6 +99,14 @@ class TestGetDatasource:
         assert ds.password == "secret"
         assert ds.database == "mydb"
 
+    def test_datasource_is_immutable(self):
+        """Datasources are shared across engine calls, so fields can't be reassigned."""
+        import dataclasses
+
+        ds = config.get_datasource(self._make_config(), "testds")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            ds.database = "other"
+
     def test_engine_specific_options(self):
         raw = self._make_config({"pg_version": 14})
         ds = config.get_datasource(raw, "testds")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import struct
 from unittest.mock import MagicMock, patch, ANY
@@ -741,6 +742,14 @@ class TestBackupWithEncryption:
         assert not key.endswith(".age")
 
 
+def _fake_downloads(store, download):
+    """Serve *download* through Store's default download_with_hash and get_bytes."""
+    from stores import Store
+    store.download.side_effect = download
+    store.download_with_hash.side_effect = functools.partial(Store.download_with_hash, store)
+    store.get_bytes.side_effect = functools.partial(Store.get_bytes, store)
+
+
 class TestRestoreWithEncryption:
     """Integration tests: restore.py + encryption."""
 
@@ -784,7 +793,7 @@ class TestRestoreWithEncryption:
             call_order.append("download")
             with open(path, "wb") as f:
                 f.write(b"encrypted data")
-        store.download.side_effect = fake_download
+        _fake_downloads(store, fake_download)
 
         from config import Datasource
         from restore import run_restore
@@ -832,7 +841,7 @@ class TestRestoreWithEncryption:
         def fake_download(key, path):
             with open(path, "wb") as f:
                 f.write(b"encrypted data")
-        store.download.side_effect = fake_download
+        _fake_downloads(store, fake_download)
 
         from config import Datasource
         from restore import run_restore
@@ -889,7 +898,7 @@ class TestRestoreWithEncryption:
             else:
                 with open(path, "wb") as f:
                     f.write(encrypted_data)
-        store.download.side_effect = fake_download
+        _fake_downloads(store, fake_download)
 
         from config import Datasource
         from restore import run_restore
@@ -931,7 +940,7 @@ class TestRestoreWithEncryption:
         def fake_download(key, path):
             with open(path, "wb") as f:
                 f.write(b"data")
-        store.download.side_effect = fake_download
+        _fake_downloads(store, fake_download)
 
         from config import Datasource
         from restore import run_restore
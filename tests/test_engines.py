@@ -558,6 +558,47 @@ class TestPostgresEngine:
         decompress_cmd = mock_popen.call_args_list[0][0][0]
         assert decompress_cmd == ["zstd", "-d", "-c"]
 
+    # -- restore with gzip: pigz preferred --------------------------------
+
+    @patch("engines.postgres.shutil.which", return_value="/usr/bin/pigz")
+    @patch("engines.postgres.subprocess.Popen")
+    def test_restore_gzip_uses_pigz_when_available(self, mock_popen, mock_which, tmp_path):
+        """pigz on PATH → gzip backups are decompressed with ["pigz", "-d", "-c"]."""
+        infile = tmp_path / "test.sql.gz"
+        infile.write_bytes(b"fake")
+
+        mock_decompress = MagicMock()
+        mock_decompress.returncode = 0
+        mock_restore = MagicMock()
+        mock_restore.communicate.return_value = (b"", b"")
+        mock_restore.returncode = 0
+        mock_popen.side_effect = [mock_decompress, mock_restore]
+
+        PostgresEngine().restore(_ds(), str(infile))
+
+        decompress_cmd = mock_popen.call_args_list[0][0][0]
+        assert decompress_cmd == ["pigz", "-d", "-c"]
+        mock_which.assert_called_with("pigz")
+
+    @patch("engines.postgres.shutil.which", return_value=None)
+    @patch("engines.postgres.subprocess.Popen")
+    def test_restore_gzip_falls_back_to_gunzip(self, mock_popen, mock_which, tmp_path):
+        """pigz not installed → gzip backups are decompressed with ["gunzip", "-c"]."""
+        infile = tmp_path / "test.sql.gz"
+        infile.write_bytes(b"fake")
+
+        mock_decompress = MagicMock()
+        mock_decompress.returncode = 0
+        mock_restore = MagicMock()
+        mock_restore.communicate.return_value = (b"", b"")
+        mock_restore.returncode = 0
+        mock_popen.side_effect = [mock_decompress, mock_restore]
+
+        PostgresEngine().restore(_ds(), str(infile))
+
+        decompress_cmd = mock_popen.call_args_list[0][0][0]
+        assert decompress_cmd == ["gunzip", "-c"]
+
     # -- restore with lz4 -------------------------------------------------
 
     @patch("engines.postgres.subprocess.Popen")
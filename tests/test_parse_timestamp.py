@@ -60,6 +60,12 @@ def test_extra_chars_after_time():
     assert parse_timestamp("db-20260101-120000extra.sql.gz") is None
 
 
+def test_short_date_digits():
+    """Date/time fields must be exactly 8 and 6 digits."""
+    assert parse_timestamp("db-2026011-120000.sql.gz") is None
+    assert parse_timestamp("db-20260101-12000.sql.gz") is None
+
+
 def test_wrong_extension_tar_bz2():
     assert parse_timestamp("db-20260101-120000.tar.bz2") is None
 
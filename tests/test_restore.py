@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch, call
 
@@ -9,7 +10,7 @@ import pytest
 
 from config import Datasource
 from restore import RestoreAborted, RestoreError, list_backups, run_restore
-from stores import BackupInfo
+from stores import BackupInfo, Store
 
 
 def _ds() -> Datasource:
@@ -29,13 +30,77 @@ def _bi(key: str, ts: datetime, size: int = 1000) -> BackupInfo:
     return BackupInfo(key=key, filename=key.rsplit("/", 1)[-1], timestamp=ts, size=size)
 
 
+_FAKE_BACKUP_BYTES = b"data"
+
+
+def _serve(backup: bytes = _FAKE_BACKUP_BYTES, sidecar: str | None = None):
+    """Build a FakeStore.download_impl serving a backup and optional .sha256 sidecar.
+
+    With sidecar=None, fetching the sidecar fails as it would for older backups.
+    """
+    def download(key, path):
+        if key.endswith(".sha256"):
+            if sidecar is None:
+                raise RuntimeError("not found")
+            with open(path, "w") as f:
+                f.write(sidecar)
+        else:
+            with open(path, "wb") as f:
+                f.write(backup)
+    return download
+
+
+class FakeStore(Store):
+    """Store stand-in for restore: serves a fixed listing, records downloads.
+
+    Only list() and download() are implemented, so restore goes through
+    Store's default get_bytes and download_with_hash. Without a download_impl,
+    every download writes _FAKE_BACKUP_BYTES to its path.
+    """
+
+    def __init__(self, backups=(), download_impl=None):
+        self.backups = list(backups)
+        self.download_impl = download_impl
+        self.downloads: list[str] = []
+
+    @property
+    def backup_downloads(self) -> list[str]:
+        """Downloaded keys, excluding .sha256 sidecars."""
+        return [k for k in self.downloads if not k.endswith(".sha256")]
+
+    def upload(self, local_path, remote_key):
+        raise AssertionError("restore never uploads")
+
+    def list(self, prefix):
+        return self.backups
+
+    def download(self, remote_key, local_path):
+        self.downloads.append(remote_key)
+        if self.download_impl is not None:
+            self.download_impl(remote_key, local_path)
+        else:
+            with open(local_path, "wb") as f:
+                f.write(_FAKE_BACKUP_BYTES)
+
+    def delete(self, remote_key):
+        raise AssertionError("restore never deletes")
+
+
+@pytest.fixture(autouse=True)
+def mock_engine(monkeypatch):
+    """Engine handed out by restore.create_engine; reports an empty database by default."""
+    engine = MagicMock()
+    engine.count_tables.return_value = 0
+    monkeypatch.setattr("restore.create_engine", lambda engine_type: engine)
+    return engine
+
+
 class TestListBackups:
     def test_prints_backups(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260101-120000.sql.gz",
                  datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc), size=2048),
-        ]
+        ])
         list_backups(store, "prod", "testdb")
         out = capsys.readouterr().out
         assert "2026-01-01 12:00:00" in out
@@ -44,168 +109,114 @@ class TestListBackups:
 
     def test_returns_backup_list(self):
         """list_backups returns the BackupInfo list for programmatic use."""
-        store = MagicMock()
         backups = [
             _bi("prod/testdb/db-20260101-120000.sql.gz",
                  datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc), size=2048),
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc), size=4096),
         ]
-        store.list.return_value = backups
+        store = FakeStore(backups=backups)
         result = list_backups(store, "prod", "testdb")
         assert result == backups
         assert len(result) == 2
 
     def test_returns_empty_list_when_no_backups(self):
         """list_backups returns [] when no backups exist."""
-        store = MagicMock()
-        store.list.return_value = []
+        store = FakeStore()
         result = list_backups(store, "prod", "testdb")
         assert result == []
 
     def test_no_backups(self, capsys):
-        store = MagicMock()
-        store.list.return_value = []
+        store = FakeStore()
         list_backups(store, "prod", "testdb")
         out = capsys.readouterr().out
         assert "No backups found" in out
 
     def test_size_formatting_bytes(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=500),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "500 B" in capsys.readouterr().out
 
     def test_size_formatting_mb(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=5 * 1024 * 1024),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "5.0 MB" in capsys.readouterr().out
 
     def test_size_formatting_gb(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=2 * 1024 ** 3),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "2.0 GB" in capsys.readouterr().out
 
 
 class TestRunRestore:
-    @patch("restore.create_engine")
-    def test_restore_latest(self, mock_create_engine, tmp_path):
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
-
-        store = MagicMock()
-        store.list.return_value = [
+    def test_restore_latest(self, mock_engine, tmp_path):
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260101-120000.sql.gz",
                  datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)),
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-
-        # download creates the file
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod")
 
         # Should pick the latest (last in sorted-oldest-first list)
-        # First download is the backup, second is the .sha256 sidecar
-        downloaded_key = store.download.call_args_list[0][0][0]
-        assert "20260102" in downloaded_key
+        assert "20260102" in store.backup_downloads[-1]
         mock_engine.restore.assert_called_once()
 
-    @patch("restore.create_engine")
-    def test_restore_specific_filename(self, mock_create_engine):
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
-
-        store = MagicMock()
-        store.list.return_value = [
+    def test_restore_specific_filename(self):
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260101-120000.sql.gz",
                  datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)),
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod", filename="db-20260101-120000.sql.gz")
 
-        downloaded_key = store.download.call_args[0][0]
-        assert "20260101" in downloaded_key
+        assert store.backup_downloads == ["prod/testdb/db-20260101-120000.sql.gz"]
 
-    @patch("restore.create_engine")
-    def test_no_backups_raises(self, mock_create_engine):
-        mock_create_engine.return_value = MagicMock()
-        store = MagicMock()
-        store.list.return_value = []
+    def test_no_backups_raises(self):
+        store = FakeStore()
         with pytest.raises(RestoreError, match="No backups found"):
             run_restore(_ds(), store, "prod")
 
-    @patch("restore.create_engine")
-    def test_filename_not_found_raises(self, mock_create_engine):
-        mock_create_engine.return_value = MagicMock()
-        store = MagicMock()
-        store.list.return_value = [
+    def test_filename_not_found_raises(self):
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260101-120000.sql.gz",
                  datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
+        ])
         with pytest.raises(RestoreError, match="not found"):
             run_restore(_ds(), store, "prod", filename="nonexistent.sql.gz")
 
-    @patch("restore.create_engine")
-    def test_existing_tables_auto_confirm(self, mock_create_engine):
+    def test_existing_tables_auto_confirm(self, mock_engine):
         """With tables and --auto-confirm, drops and restores."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 15
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod", auto_confirm=True)
 
         mock_engine.drop_and_recreate.assert_called_once()
         mock_engine.restore.assert_called_once()
 
-    @patch("restore.create_engine")
     @patch("builtins.input", return_value="n")
-    def test_existing_tables_user_declines_raises(self, mock_input, mock_create_engine):
+    def test_existing_tables_user_declines_raises(self, mock_input, mock_engine):
         """With tables and user says no, raises RestoreAborted."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RestoreAborted, match="aborted"):
             run_restore(_ds(), store, "prod")
@@ -213,91 +224,56 @@ class TestRunRestore:
         mock_engine.drop_and_recreate.assert_not_called()
         mock_engine.restore.assert_not_called()
 
-    @patch("restore.create_engine")
     @patch("builtins.input", return_value="y")
-    def test_existing_tables_user_confirms(self, mock_input, mock_create_engine):
+    def test_existing_tables_user_confirms(self, mock_input, mock_engine):
         """With tables and user says yes, drops and restores."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod")
 
         mock_engine.drop_and_recreate.assert_called_once()
         mock_engine.restore.assert_called_once()
 
-    @patch("restore.create_engine")
-    def test_engine_restore_failure_propagates(self, mock_create_engine):
+    def test_engine_restore_failure_propagates(self, mock_engine):
         """If engine.restore() fails, error propagates."""
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
         mock_engine.restore.side_effect = RuntimeError("psql failed")
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RuntimeError, match="psql failed"):
             run_restore(_ds(), store, "prod")
 
-    @patch("restore.create_engine")
-    def test_drop_recreate_failure_propagates(self, mock_create_engine):
+    def test_drop_recreate_failure_propagates(self, mock_engine):
         """If drop_and_recreate fails, error propagates after download+verify."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 10
         mock_engine.drop_and_recreate.side_effect = RuntimeError("permission denied")
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RuntimeError, match="permission denied"):
             run_restore(_ds(), store, "prod", auto_confirm=True)
 
-        assert store.download.call_count >= 1  # backup + possibly sidecar
+        assert len(store.backup_downloads) == 1
         mock_engine.verify.assert_called_once()
         mock_engine.restore.assert_not_called()
 
-    @patch("restore.create_engine")
-    def test_empty_database_skips_drop(self, mock_create_engine):
+    def test_empty_database_skips_drop(self, mock_engine):
         """Zero tables → no drop, just restore."""
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
-
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod")
 
@@ -307,149 +283,119 @@ class TestRunRestore:
 
 class TestListBackupsEdgeCases:
     def test_size_exactly_1kb(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=1024),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "1.0 KB" in capsys.readouterr().out
 
     def test_size_exactly_1mb(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=1024 * 1024),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "1.0 MB" in capsys.readouterr().out
 
     def test_size_exactly_1gb(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=1024 ** 3),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "1.0 GB" in capsys.readouterr().out
 
     def test_size_zero_bytes(self, capsys):
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("k", datetime(2026, 1, 1, tzinfo=timezone.utc), size=0),
-        ]
+        ])
         list_backups(store, "", "db")
         assert "0 B" in capsys.readouterr().out
 
     def test_multiple_backups_sorted(self, capsys):
         """List displays multiple backups and total count."""
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("a", datetime(2026, 1, 1, tzinfo=timezone.utc), size=100),
             _bi("b", datetime(2026, 1, 2, tzinfo=timezone.utc), size=200),
             _bi("c", datetime(2026, 1, 3, tzinfo=timezone.utc), size=300),
-        ]
+        ])
         list_backups(store, "", "db")
         out = capsys.readouterr().out
         assert "Total: 3 backup(s)" in out
 
+    def test_timestamp_fields_zero_padded(self, capsys):
+        """Single-digit date/time fields print zero-padded, as strftime would."""
+        store = FakeStore(backups=[
+            _bi("k", datetime(2026, 3, 4, 5, 6, 7, tzinfo=timezone.utc)),
+        ])
+        list_backups(store, "", "db")
+        assert "2026-03-04 05:06:07" in capsys.readouterr().out
+
 
 class TestRunRestoreEdgeCases:
-    @patch("restore.create_engine")
     @patch("builtins.input", return_value="YES")
-    def test_user_input_yes_uppercase_accepted(self, mock_input, mock_create_engine):
+    def test_user_input_yes_uppercase_accepted(self, mock_input, mock_engine):
         """'YES' (uppercase) → .lower() converts to 'yes' → accepted."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod")
         mock_engine.drop_and_recreate.assert_called_once()
 
-    @patch("restore.create_engine")
     @patch("builtins.input", return_value="nah")
-    def test_user_input_other_text_raises(self, mock_input, mock_create_engine):
+    def test_user_input_other_text_raises(self, mock_input, mock_engine):
         """Any text besides 'y'/'yes' → RestoreAborted."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RestoreAborted):
             run_restore(_ds(), store, "prod")
 
-    @patch("restore.create_engine")
     @patch("builtins.input", return_value="yes")
-    def test_user_input_yes_lowercase_accepted(self, mock_input, mock_create_engine):
+    def test_user_input_yes_lowercase_accepted(self, mock_input, mock_engine):
         """'yes' (lowercase) should be accepted."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         run_restore(_ds(), store, "prod")
         mock_engine.drop_and_recreate.assert_called_once()
         mock_engine.restore.assert_called_once()
 
-    @patch("restore.create_engine")
     @patch("builtins.input", return_value="")
-    def test_user_input_empty_raises(self, mock_input, mock_create_engine):
+    def test_user_input_empty_raises(self, mock_input, mock_engine):
         """Empty input → RestoreAborted (not in 'y', 'yes')."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RestoreAborted):
             run_restore(_ds(), store, "prod")
 
-    @patch("restore.create_engine")
-    def test_download_failure_prevents_drop(self, mock_create_engine):
+    def test_download_failure_prevents_drop(self, mock_engine):
         """If download fails, database is NOT dropped (download happens first)."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 5
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        store.download.side_effect = RuntimeError("network error")
+        ])
+
+        def fake_download(key, path):
+            raise RuntimeError("network error")
+        store.download_impl = fake_download
 
         with pytest.raises(RuntimeError, match="network error"):
             run_restore(_ds(), store, "prod", auto_confirm=True)
@@ -460,27 +406,22 @@ class TestRunRestoreEdgeCases:
 
 
 class TestRestoreVerification:
-    @patch("restore.create_engine")
-    def test_verify_called_before_restore(self, mock_create_engine):
+    def test_verify_called_before_restore(self, mock_engine):
         """engine.verify called after download and before engine.restore."""
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
 
         call_order = []
         mock_engine.verify.side_effect = lambda ds, path: call_order.append("verify")
         mock_engine.restore.side_effect = lambda ds, path: call_order.append("restore")
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
+        ])
         def fake_download(key, path):
             call_order.append("download")
             with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+                f.write(_FAKE_BACKUP_BYTES)
+        store.download_impl = fake_download
 
         run_restore(_ds(), store, "prod")
 
@@ -491,46 +432,29 @@ class TestRestoreVerification:
         restore_idx = call_order.index("restore")
         assert verify_idx < restore_idx
 
-    @patch("restore.create_engine")
-    def test_verify_failure_prevents_restore(self, mock_create_engine):
+    def test_verify_failure_prevents_restore(self, mock_engine):
         """engine.verify raises → engine.restore never called."""
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
         mock_engine.verify.side_effect = RuntimeError("corrupt backup")
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RuntimeError, match="corrupt backup"):
             run_restore(_ds(), store, "prod")
 
         mock_engine.restore.assert_not_called()
 
-    @patch("restore.create_engine")
-    def test_verify_failure_prevents_drop(self, mock_create_engine):
+    def test_verify_failure_prevents_drop(self, mock_engine):
         """Verify fails → DB is NOT dropped (verify happens before drop)."""
-        mock_engine = MagicMock()
         mock_engine.count_tables.return_value = 10
         mock_engine.verify.side_effect = RuntimeError("corrupt backup")
-        mock_create_engine.return_value = mock_engine
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-        def fake_download(key, path):
-            with open(path, "wb") as f:
-                f.write(b"data")
-        store.download.side_effect = fake_download
+        ])
 
         with pytest.raises(RuntimeError, match="corrupt backup"):
             run_restore(_ds(), store, "prod", auto_confirm=True)
@@ -540,85 +464,74 @@ class TestRestoreVerification:
 
 
 class TestRestoreChecksum:
-    @patch("restore.create_engine")
-    def test_checksum_verified_when_sidecar_present(self, mock_create_engine):
-        """Valid .sha256 sidecar → checksum verified, restore proceeds."""
-        import hashlib
+    def test_backup_and_sidecar_each_fetched_once(self, mock_engine):
+        """Restore downloads the backup and reads its .sha256 sidecar, once each."""
+        store = FakeStore(backups=[
+            _bi("prod/testdb/db-20260102-120000.sql.gz",
+                 datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
+        ])
+
+        store.download_impl = _serve(b"backup", sidecar=hashlib.sha256(b"backup").hexdigest())
+
+        run_restore(_ds(), store, "prod")
+
+        assert sorted(store.downloads) == [
+            "prod/testdb/db-20260102-120000.sql.gz",
+            "prod/testdb/db-20260102-120000.sql.gz.sha256",
+        ]
+        mock_engine.restore.assert_called_once()
 
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
+    def test_checksum_verified_when_sidecar_present(self, mock_engine):
+        """Valid .sha256 sidecar → checksum verified, restore proceeds."""
 
         backup_data = b"backup content"
         expected_hash = hashlib.sha256(backup_data).hexdigest()
 
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-
-        def fake_download(key, path):
-            if key.endswith(".sha256"):
-                with open(path, "w") as f:
-                    f.write(expected_hash)
-            else:
-                with open(path, "wb") as f:
-                    f.write(backup_data)
+        ])
 
-        store.download.side_effect = fake_download
+        store.download_impl = _serve(backup_data, sidecar=expected_hash)
 
         run_restore(_ds(), store, "prod")
         mock_engine.restore.assert_called_once()
 
-    @patch("restore.create_engine")
-    def test_checksum_mismatch_raises(self, mock_create_engine):
+    def test_checksum_mismatch_raises(self, mock_engine):
         """Checksum mismatch → RuntimeError, restore aborted."""
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
-
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
+        ])
 
-        def fake_download(key, path):
-            if key.endswith(".sha256"):
-                with open(path, "w") as f:
-                    f.write("a" * 64)  # wrong hash
-            else:
-                with open(path, "wb") as f:
-                    f.write(b"backup content")
-
-        store.download.side_effect = fake_download
+        store.download_impl = _serve(b"backup content", sidecar="a" * 64)  # wrong hash
 
         with pytest.raises(RuntimeError, match="Checksum mismatch"):
             run_restore(_ds(), store, "prod")
 
         mock_engine.restore.assert_not_called()
 
-    @patch("restore.create_engine")
-    def test_missing_sidecar_gracefully_skipped(self, mock_create_engine):
+    def test_missing_sidecar_gracefully_skipped(self, mock_engine):
         """No .sha256 sidecar → restore proceeds (backwards compatible)."""
-        mock_engine = MagicMock()
-        mock_engine.count_tables.return_value = 0
-        mock_create_engine.return_value = mock_engine
-
-        store = MagicMock()
-        store.list.return_value = [
+        store = FakeStore(backups=[
             _bi("prod/testdb/db-20260102-120000.sql.gz",
                  datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
-        ]
-
-        def fake_download(key, path):
-            if key.endswith(".sha256"):
-                raise RuntimeError("not found")
-            with open(path, "wb") as f:
-                f.write(b"backup content")
+        ])
 
-        store.download.side_effect = fake_download
+        store.download_impl = _serve(b"backup content")  # no sidecar
 
         run_restore(_ds(), store, "prod")
         mock_engine.restore.assert_called_once()
+
+    @patch("restore.sha256_file")
+    def test_missing_sidecar_skips_hashing(self, mock_sha256, mock_engine):
+        """Without a sidecar there is nothing to compare, so the backup isn't hashed."""
+        store = FakeStore(backups=[
+            _bi("prod/testdb/db-20260102-120000.sql.gz",
+                 datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)),
+        ])
+
+        store.download_impl = _serve(b"backup content")  # no sidecar
+
+        run_restore(_ds(), store, "prod")
+        mock_sha256.assert_not_called()
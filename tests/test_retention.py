@@ -8,46 +8,122 @@ from datetime import datetime, timedelta, timezone
 import pytest
 
 from retention import compute_keep_set, apply_retention
-from stores import BackupInfo
+from stores import BackupInfo, Store
 from config import RetentionPolicy
 
 
+_DEFAULT_REF = datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+
 def _bi(key: str, days_ago: int, ref: datetime | None = None) -> BackupInfo:
     """Helper: create a BackupInfo with a timestamp N days before ref."""
-    ref = ref or datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
+    ref = ref if ref is not None else _DEFAULT_REF
     ts = ref - timedelta(days=days_ago)
     return BackupInfo(
         key=key,
-        filename=f"db-{ts.strftime('%Y%m%d-%H%M%S')}.sql.gz",
+        filename=(f"db-{ts.year:04d}{ts.month:02d}{ts.day:02d}-"
+                  f"{ts.hour:02d}{ts.minute:02d}{ts.second:02d}.sql.gz"),
         timestamp=ts,
         size=1000,
     )
 
 
+# Shared daily listings (b0 = newest, one backup per day before _DEFAULT_REF).
+# BackupInfo is frozen and nothing mutates these lists, so module scope is safe.
+@pytest.fixture(scope="module")
+def backups_5_daily() -> list[BackupInfo]:
+    return [_bi(f"b{i}", i) for i in range(5)]
+
+
+@pytest.fixture(scope="module")
+def backups_30_daily() -> list[BackupInfo]:
+    return [_bi(f"b{i}", i) for i in range(30)]
+
+
+def _bi_at(key: str, year: int, month: int, day: int) -> BackupInfo:
+    """Helper: create a BackupInfo taken at noon UTC on the given date."""
+    return _bi(key, 0, ref=datetime(year, month, day, 12, 0, 0, tzinfo=timezone.utc))
+
+
+class FakeStore(Store):
+    """Store stand-in for apply_retention: serves a fixed listing, records calls.
+
+    on_delete, if given, runs for each delete (e.g. to raise); deleted keys
+    are recorded only when it returns normally. delete_many is inherited, so
+    batched deletes go through delete() one key at a time.
+    """
+
+    def __init__(self, items=(), on_delete=None):
+        self.items = list(items)
+        self.on_delete = on_delete
+        self.listed: list[str] = []
+        self.deleted: list[str] = []
+
+    def upload(self, local_path, remote_key):
+        raise AssertionError("retention never uploads")
+
+    def download(self, remote_key, local_path):
+        raise AssertionError("retention never downloads")
+
+    def list(self, prefix):
+        self.listed.append(prefix)
+        return self.items
+
+    def delete(self, key):
+        if self.on_delete is not None:
+            self.on_delete(key)
+        self.deleted.append(key)
+
+
 class TestComputeKeepSet:
     def test_empty_backups(self):
         policy = RetentionPolicy(keep_last=5)
         assert compute_keep_set([], policy) == set()
 
-    def test_keep_last(self):
-        backups = [_bi(f"b{i}", i) for i in range(10)]  # b0=newest ... b9=oldest
-        policy = RetentionPolicy(keep_last=3)
-        keep = compute_keep_set(backups, policy)
-        assert keep == {"b0", "b1", "b2"}
-
-    def test_keep_last_more_than_available(self):
-        backups = [_bi("b0", 0), _bi("b1", 1)]
-        policy = RetentionPolicy(keep_last=10)
-        keep = compute_keep_set(backups, policy)
-        assert keep == {"b0", "b1"}
-
-    def test_keep_daily(self):
-        # 10 backups, one per day
-        backups = [_bi(f"d{i}", i) for i in range(10)]
-        policy = RetentionPolicy(keep_daily=3)
-        keep = compute_keep_set(backups, policy)
-        # Should keep the newest backup from each of the 3 most recent days
-        assert keep == {"d0", "d1", "d2"}
+    @pytest.mark.parametrize("make_backups,policy,expected", [
+        pytest.param(
+            lambda: [_bi(f"b{i}", i) for i in range(10)],
+            RetentionPolicy(keep_last=3), {"b0", "b1", "b2"},
+            id="keep_last",
+        ),
+        pytest.param(
+            lambda: [_bi("b0", 0), _bi("b1", 1)],
+            RetentionPolicy(keep_last=10), {"b0", "b1"},
+            id="keep_last_more_than_available",
+        ),
+        pytest.param(
+            # One per day: keep the newest backup from each of the 3 most recent days
+            lambda: [_bi(f"b{i}", i) for i in range(10)],
+            RetentionPolicy(keep_daily=3), {"b0", "b1", "b2"},
+            id="keep_daily",
+        ),
+        pytest.param(
+            # One per week: keep the 2 most recent ISO weeks
+            lambda: [_bi(f"w{i}", i * 7) for i in range(5)],
+            RetentionPolicy(keep_weekly=2), {"w0", "w1"},
+            id="keep_weekly",
+        ),
+        pytest.param(
+            lambda: [_bi_at("jun", 2026, 6, 15), _bi_at("may", 2026, 5, 15),
+                     _bi_at("apr", 2026, 4, 15), _bi_at("mar", 2026, 3, 15)],
+            RetentionPolicy(keep_monthly=3), {"jun", "may", "apr"},
+            id="keep_monthly",
+        ),
+        pytest.param(
+            lambda: [_bi_at("y2026", 2026, 1, 1), _bi_at("y2025", 2025, 1, 1),
+                     _bi_at("y2024", 2024, 1, 1)],
+            RetentionPolicy(keep_yearly=2), {"y2026", "y2025"},
+            id="keep_yearly",
+        ),
+    ])
+    def test_single_rule(self, make_backups, policy, expected):
+        assert compute_keep_set(make_backups(), policy) == expected
+
+    def test_unsorted_input(self, backups_5_daily):
+        """Input order doesn't matter: rules still pick the newest per period."""
+        shuffled = [backups_5_daily[i] for i in (3, 0, 4, 1, 2)]
+        policy = RetentionPolicy(keep_last=1, keep_daily=3)
+        assert compute_keep_set(shuffled, policy) == {"b0", "b1", "b2"}
 
     def test_keep_daily_multiple_per_day(self):
         """When multiple backups exist on the same day, keep only the newest."""
@@ -65,49 +141,10 @@ class TestComputeKeepSet:
         # Day 2026-02-10: keep "evening" (newest), Day 2026-02-09: keep "yesterday"
         assert keep == {"evening", "yesterday"}
 
-    def test_keep_weekly(self):
-        # Backups spanning several weeks
-        backups = [_bi(f"w{i}", i * 7) for i in range(5)]
-        policy = RetentionPolicy(keep_weekly=2)
-        keep = compute_keep_set(backups, policy)
-        assert len(keep) == 2
-        assert "w0" in keep  # most recent week
-
-    def test_keep_monthly(self):
-        ref = datetime(2026, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
-        backups = [
-            BackupInfo(key="jun", filename="db-20260615-120000.sql.gz",
-                       timestamp=datetime(2026, 6, 15, 12, 0, 0, tzinfo=timezone.utc), size=100),
-            BackupInfo(key="may", filename="db-20260515-120000.sql.gz",
-                       timestamp=datetime(2026, 5, 15, 12, 0, 0, tzinfo=timezone.utc), size=100),
-            BackupInfo(key="apr", filename="db-20260415-120000.sql.gz",
-                       timestamp=datetime(2026, 4, 15, 12, 0, 0, tzinfo=timezone.utc), size=100),
-            BackupInfo(key="mar", filename="db-20260315-120000.sql.gz",
-                       timestamp=datetime(2026, 3, 15, 12, 0, 0, tzinfo=timezone.utc), size=100),
-        ]
-        policy = RetentionPolicy(keep_monthly=3)
-        keep = compute_keep_set(backups, policy, now=ref)
-        assert keep == {"jun", "may", "apr"}
-
-    def test_keep_yearly(self):
-        backups = [
-            BackupInfo(key="y2026", filename="db-20260101-120000.sql.gz",
-                       timestamp=datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc), size=100),
-            BackupInfo(key="y2025", filename="db-20250101-120000.sql.gz",
-                       timestamp=datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc), size=100),
-            BackupInfo(key="y2024", filename="db-20240101-120000.sql.gz",
-                       timestamp=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc), size=100),
-        ]
-        policy = RetentionPolicy(keep_yearly=2)
-        keep = compute_keep_set(backups, policy)
-        assert keep == {"y2026", "y2025"}
-
-    def test_combined_rules_union(self):
+    def test_combined_rules_union(self, backups_30_daily):
         """Multiple rules: a backup kept by ANY rule is protected."""
-        ref = datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
-        backups = [_bi(f"b{i}", i, ref) for i in range(30)]
         policy = RetentionPolicy(keep_last=2, keep_daily=5)
-        keep = compute_keep_set(backups, policy, now=ref)
+        keep = compute_keep_set(backups_30_daily, policy, now=_DEFAULT_REF)
         # keep_last protects b0, b1. keep_daily protects b0..b4.
         # Union: b0..b4
         assert keep == {"b0", "b1", "b2", "b3", "b4"}
@@ -157,12 +194,10 @@ class TestComputeKeepSet:
         keep = compute_keep_set(backups, policy)
         assert len(keep) == 2
 
-    def test_overlapping_rules_no_double_count(self):
+    def test_overlapping_rules_no_double_count(self, backups_5_daily):
         """A backup kept by both keep_last and keep_daily is counted once."""
-        ref = datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
-        backups = [_bi(f"b{i}", i, ref) for i in range(5)]
         policy = RetentionPolicy(keep_last=1, keep_daily=1)
-        keep = compute_keep_set(backups, policy, now=ref)
+        keep = compute_keep_set(backups_5_daily, policy, now=_DEFAULT_REF)
         # Both rules keep b0 — only 1 entry in the set
         assert keep == {"b0"}
 
@@ -170,79 +205,64 @@ class TestComputeKeepSet:
 class TestApplyRetention:
     def test_no_backups(self):
         """No backups → no-op, no errors."""
-        class FakeStore:
-            def list(self, prefix): return []
-            def delete(self, key): pytest.fail("delete should not be called")
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=1))
+        store = FakeStore()
+        apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=1))
+        assert store.deleted == []
 
     def test_no_rules_keeps_all(self):
         """No retention rules → keeps everything."""
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi("b0", 0), _bi("b1", 1)]
-            def delete(self, key): pytest.fail("delete should not be called")
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy())
-
-    def test_deletes_expired(self):
-        deleted = []
-
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi(f"b{i}", i) for i in range(5)]
-            def delete(self, key):
-                deleted.append(key)
-
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=2))
+        store = FakeStore([_bi("b0", 0), _bi("b1", 1)])
+        apply_retention(store, "pfx", "db", RetentionPolicy())
+        assert store.deleted == []
+
+    def test_deletes_expired(self, backups_5_daily):
+        store = FakeStore(backups_5_daily)
+        apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=2))
         # b0, b1 kept; b2, b3, b4 deleted (plus their .sha256 sidecars)
-        assert set(deleted) == {
+        assert set(store.deleted) == {
             "b2", "b2.sha256",
             "b3", "b3.sha256",
             "b4", "b4.sha256",
         }
 
+    def test_deletes_expired_batch(self, backups_5_daily):
+        """Expired backups and their sidecars go to the store in one delete_many call."""
+        batches = []
+
+        class BatchStore(FakeStore):
+            def delete_many(self, keys, allow_missing=()):
+                batches.append((keys, set(allow_missing)))
+
+        apply_retention(BatchStore(backups_5_daily), "pfx", "db", RetentionPolicy(keep_last=2))
+        assert len(batches) == 1
+        keys, allow_missing = batches[0]
+        assert set(keys) == {"b2", "b2.sha256", "b3", "b3.sha256", "b4", "b4.sha256"}
+        assert allow_missing == {"b2.sha256", "b3.sha256", "b4.sha256"}
+
     def test_all_kept_nothing_deleted(self):
         """When policy keeps everything, delete is never called."""
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi("b0", 0), _bi("b1", 1)]
-            def delete(self, key):
-                pytest.fail("delete should not be called")
-
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=10))
+        store = FakeStore([_bi("b0", 0), _bi("b1", 1)])
+        apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=10))
+        assert store.deleted == []
 
     def test_uses_build_prefix(self):
         """Verify apply_retention passes the correct prefix to store.list."""
-        listed_prefix = []
-
-        class FakeStore:
-            def list(self, prefix):
-                listed_prefix.append(prefix)
-                return []
-
-        apply_retention(FakeStore(), "prod", "mydb", RetentionPolicy(keep_last=1))
-        assert listed_prefix == ["prod/mydb"]
+        store = FakeStore()
+        apply_retention(store, "prod", "mydb", RetentionPolicy(keep_last=1))
+        assert store.listed == ["prod/mydb"]
 
-    def test_dry_run_no_deletes(self):
+    def test_dry_run_no_deletes(self, backups_5_daily):
         """dry_run=True → store.delete never called."""
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi(f"b{i}", i) for i in range(5)]
-            def delete(self, key):
-                pytest.fail("delete should not be called in dry run")
-
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=2), dry_run=True)
+        store = FakeStore(backups_5_daily)
+        apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=2), dry_run=True)
+        assert store.deleted == []
 
     def test_dry_run_logs_what_would_delete(self, caplog):
         """dry_run=True → logs 'Would delete' and 'Dry run: would prune'."""
-
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi(f"b{i}", i) for i in range(3)]
-            def delete(self, key):
-                pytest.fail("delete should not be called in dry run")
-
+        store = FakeStore([_bi(f"b{i}", i) for i in range(3)])
         with caplog.at_level(logging.INFO):
-            apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=1), dry_run=True)
+            apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=1), dry_run=True)
+        assert store.deleted == []
         assert "Would delete" in caplog.text
         assert "Dry run: would prune" in caplog.text
 
@@ -252,13 +272,7 @@ class TestRetentionEdgeCases:
         """All 5 retention rules active simultaneously."""
         ref = datetime(2026, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
         # Create backups spanning 2 years (one per week)
-        backups = []
-        for i in range(104):  # ~2 years of weekly backups
-            ts = ref - timedelta(days=i * 7)
-            backups.append(BackupInfo(
-                key=f"b{i}", filename=f"db-{ts.strftime('%Y%m%d-%H%M%S')}.sql.gz",
-                timestamp=ts, size=1000,
-            ))
+        backups = [_bi(f"b{i}", i * 7, ref=ref) for i in range(104)]
         policy = RetentionPolicy(
             keep_last=3, keep_daily=7, keep_weekly=4,
             keep_monthly=6, keep_yearly=2,
@@ -271,7 +285,7 @@ class TestRetentionEdgeCases:
 
     def test_same_second_timestamps(self):
         """Multiple backups with identical timestamps → only one kept per bucket."""
-        ref = datetime(2026, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
+        ref = _DEFAULT_REF
         ts = ref
         backups = [
             BackupInfo(key="a", filename="db-20260210-120000.sql.gz", timestamp=ts, size=100),
@@ -310,47 +324,33 @@ class TestRetentionEdgeCases:
 
     def test_apply_retention_delete_failure_propagates(self):
         """If store.delete() fails, the error propagates."""
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi("b0", 0), _bi("b1", 1)]
-            def delete(self, key):
-                raise RuntimeError("S3 permission denied")
+        def deny(key):
+            raise RuntimeError("S3 permission denied")
 
+        store = FakeStore([_bi("b0", 0), _bi("b1", 1)], on_delete=deny)
         with pytest.raises(RuntimeError, match="S3 permission denied"):
-            apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=1))
+            apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=1))
 
     def test_sidecar_deleted_with_backup(self):
         """When a backup is deleted, its .sha256 sidecar is also deleted."""
-        deleted = []
-
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi(f"b{i}", i) for i in range(3)]
-            def delete(self, key):
-                deleted.append(key)
-
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=1))
+        store = FakeStore([_bi(f"b{i}", i) for i in range(3)])
+        apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=1))
         # b1 and b2 deleted, plus their sidecars
-        assert "b1" in deleted
-        assert "b1.sha256" in deleted
-        assert "b2" in deleted
-        assert "b2.sha256" in deleted
+        assert "b1" in store.deleted
+        assert "b1.sha256" in store.deleted
+        assert "b2" in store.deleted
+        assert "b2.sha256" in store.deleted
 
     def test_sidecar_deletion_failure_silenced(self):
         """If sidecar deletion fails, it is silenced (sidecar may not exist)."""
-        deleted = []
-
-        class FakeStore:
-            def list(self, prefix):
-                return [_bi(f"b{i}", i) for i in range(2)]
-            def delete(self, key):
-                if key.endswith(".sha256"):
-                    raise RuntimeError("not found")
-                deleted.append(key)
+        def missing_sidecar(key):
+            if key.endswith(".sha256"):
+                raise RuntimeError("not found")
 
+        store = FakeStore([_bi(f"b{i}", i) for i in range(2)], on_delete=missing_sidecar)
         # Should not raise
-        apply_retention(FakeStore(), "pfx", "db", RetentionPolicy(keep_last=1))
-        assert "b1" in deleted
+        apply_retention(store, "pfx", "db", RetentionPolicy(keep_last=1))
+        assert "b1" in store.deleted
 
     def test_leap_year_monthly(self):
         """Monthly retention spanning Feb 28/29 in a leap year."""
@@ -2,21 +2,163 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
+import subprocess
 from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import MagicMock, Mock, patch, call
 
 import pytest
 
 from config import ConfigError
 from stores import create_store, BackupInfo, BACKUP_EXTENSIONS, Store, parse_timestamp, is_backup_file
-from stores.s3 import S3Store
+from stores.s3 import S3Store, _make_client
 from stores.ssh import SSHStore
 
 
+# (pages, prefix, expected [(filename, size), ...]) for S3Store.list
+_S3_LIST_CASES = [
+    pytest.param(
+        [{"Contents": [
+            {"Key": "prod/db/db-20260102-120000.sql.gz", "Size": 2048},
+            {"Key": "prod/db/db-20260101-120000.sql.gz", "Size": 1024},
+            {"Key": "prod/db/readme.txt", "Size": 100},  # should be skipped
+        ]}],
+        "prod/db",
+        [("db-20260101-120000.sql.gz", 1024), ("db-20260102-120000.sql.gz", 2048)],
+        id="basic",
+    ),
+    pytest.param(
+        [{"Contents": [{"Key": "prod/db/not-a-backup.sql.gz", "Size": 100}]}],
+        "prod/db",
+        [],
+        id="skips-unparseable",
+    ),
+    pytest.param(
+        [
+            {"Contents": [{"Key": "prod/db/db-20260101-120000.sql.gz", "Size": 1024}]},
+            {"Contents": [{"Key": "prod/db/db-20260102-120000.sql.gz", "Size": 2048}]},
+        ],
+        "prod/db",
+        [("db-20260101-120000.sql.gz", 1024), ("db-20260102-120000.sql.gz", 2048)],
+        id="multi-page",
+    ),
+    pytest.param([{}], "prod/db", [], id="empty-page"),  # no Contents
+    pytest.param(
+        [{"Contents": [{"Key": "db-20260101-120000.sql.gz", "Size": 500}]}],
+        "",
+        [("db-20260101-120000.sql.gz", 500)],
+        id="file-at-root",
+    ),
+    pytest.param(
+        [{"Contents": [
+            {"Key": "prod/db/db-20260101-120000.sql.gz", "Size": 1024},
+            {"Key": "prod/db/db-20260102-120000.sql.zst", "Size": 2048},
+            {"Key": "prod/db/db-20260103-120000.dump.lz4", "Size": 512},
+            {"Key": "prod/db/db-20260104-120000.dump", "Size": 4096},
+            {"Key": "prod/db/db-20260105-120000.sql", "Size": 8192},
+        ]}],
+        "prod/db",
+        [
+            ("db-20260101-120000.sql.gz", 1024),
+            ("db-20260102-120000.sql.zst", 2048),
+            ("db-20260103-120000.dump.lz4", 512),
+            ("db-20260104-120000.dump", 4096),
+            ("db-20260105-120000.sql", 8192),
+        ],
+        id="mixed-extensions",
+    ),
+    pytest.param(
+        [{"Contents": [
+            {"Key": "prod/db/db-20260101-120000.tar.gz", "Size": 1024},
+            {"Key": "prod/db/db-20260102-120000.sql.gz", "Size": 2048},
+        ]}],
+        "prod/db",
+        [("db-20260102-120000.sql.gz", 2048)],
+        id="skips-unknown-extensions",
+    ),
+    pytest.param(
+        [{"Contents": [{"Key": "prod/db/db-20260101-120000.sql.gz"}]}],  # no Size
+        "prod/db",
+        [("db-20260101-120000.sql.gz", 0)],
+        id="missing-size",
+    ),
+]
+
+
+# `find -printf '%s\t%p\n'` lines as returned by SSHStore's list command
+_SSH_LINE_1 = "1024\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
+_SSH_LINE_2 = "2048\t/data/backups/prod/db/db-20260102-120000.sql.gz\n"
+_SSH_MALFORMED = "this line has no tab\n"
+_SSH_BAD_TS = "500\t/data/backups/prod/db/random-file.sql.gz\n"
+_SSH_NAN_SIZE = "NaN\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
+
+_SSH_ENTRY_1 = ("prod/db/db-20260101-120000.sql.gz", 1024)
+_SSH_ENTRY_2 = ("prod/db/db-20260102-120000.sql.gz", 2048)
+
+# (stdout, expected [(key, size), ...]) for SSHStore.list
+_SSH_LIST_CASES = [
+    pytest.param(_SSH_LINE_2 + _SSH_LINE_1, [_SSH_ENTRY_1, _SSH_ENTRY_2], id="parses-output"),
+    pytest.param("", [], id="empty"),
+    pytest.param(
+        _SSH_LINE_1 + _SSH_MALFORMED + _SSH_LINE_2, [_SSH_ENTRY_1, _SSH_ENTRY_2],
+        id="malformed-lines-skipped",
+    ),
+    pytest.param(_SSH_LINE_1 + _SSH_BAD_TS, [_SSH_ENTRY_1], id="unparseable-timestamp-skipped"),
+    pytest.param("\n\n" + _SSH_LINE_1 + "\n", [_SSH_ENTRY_1], id="blank-lines-skipped"),
+    pytest.param(
+        _SSH_LINE_1
+        + "2048\t/data/backups/prod/db/db-20260102-120000.dump.zst\n"
+        + "512\t/data/backups/prod/db/db-20260103-120000.sql.lz4\n",
+        [
+            _SSH_ENTRY_1,
+            ("prod/db/db-20260102-120000.dump.zst", 2048),
+            ("prod/db/db-20260103-120000.sql.lz4", 512),
+        ],
+        id="mixed-extensions",
+    ),
+]
+
+
+# The boto3 client methods S3Store calls; anything else is a test bug.
+_S3_CLIENT_METHODS = (
+    "upload_file", "head_object", "download_file", "download_fileobj", "get_object",
+    "get_paginator", "delete_object", "delete_objects",
+)
+
+
+@pytest.fixture(autouse=True)
+def mock_boto(monkeypatch):
+    """Stand-in boto3 for stores.s3; no test in this module talks to S3.
+
+    S3 clients are cached per connection, so the cache is cleared around each
+    test to make every store build its client from this test's stand-in.
+    """
+    boto = Mock()
+    monkeypatch.setattr("stores.s3.boto3", boto)
+    _make_client.cache_clear()
+    yield boto
+    _make_client.cache_clear()
+
+
+@pytest.fixture
+def mock_client(mock_boto):
+    """boto3 S3 client handed to every S3Store built during the test."""
+    client = Mock(spec_set=_S3_CLIENT_METHODS)
+    mock_boto.session.Session.return_value.client.return_value = client
+    return client
+
+
+@pytest.fixture
+def mock_run():
+    """Patched subprocess.run for SSHStore; commands succeed by default."""
+    with patch("stores.ssh.subprocess.run") as m:
+        m.return_value = subprocess.CompletedProcess([], 0, stdout="", stderr="")
+        yield m
+
+
 class TestCreateStore:
-    @patch("stores.s3.boto3")
-    def test_creates_s3(self, mock_boto):
+    def test_creates_s3(self):
         store = create_store({"type": "s3", "bucket": "b"})
         assert isinstance(store, S3Store)
 
@@ -33,200 +175,118 @@ class TestCreateStore:
 
 class TestS3Store:
     @patch("stores.s3.os.path.getsize", return_value=1024)
-    @patch("stores.s3.boto3")
-    def test_upload(self, mock_boto, mock_getsize):
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
+    def test_upload(self, mock_getsize, mock_client):
         mock_client.head_object.return_value = {"ContentLength": 1024}
 
         store = S3Store(bucket="mybucket")
         store.upload("/tmp/file.sql.gz", "prefix/file.sql.gz")
         args, kwargs = mock_client.upload_file.call_args
         assert args == ("/tmp/file.sql.gz", "mybucket", "prefix/file.sql.gz")
-        assert "Config" in kwargs
+        assert kwargs["Config"].multipart_chunksize == 16 * 1024 * 1024
+        assert kwargs["Config"].max_concurrency == 4
         mock_client.head_object.assert_called_once_with(
             Bucket="mybucket", Key="prefix/file.sql.gz"
         )
 
     @patch("stores.s3.os.path.getsize", return_value=1024)
-    @patch("stores.s3.boto3")
-    def test_upload_size_mismatch_raises(self, mock_boto, mock_getsize):
+    def test_upload_size_mismatch_raises(self, mock_getsize, mock_client):
         """Upload succeeds but remote size differs → RuntimeError."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
         mock_client.head_object.return_value = {"ContentLength": 512}
 
         store = S3Store(bucket="mybucket")
         with pytest.raises(RuntimeError, match="Upload verification failed"):
             store.upload("/tmp/file.sql.gz", "prefix/file.sql.gz")
 
-    @patch("stores.s3.boto3")
-    def test_download(self, mock_boto):
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
+    def test_download(self, mock_client):
         store = S3Store(bucket="mybucket")
         store.download("prefix/file.sql.gz", "/tmp/file.sql.gz")
         args, kwargs = mock_client.download_file.call_args
         assert args == ("mybucket", "prefix/file.sql.gz", "/tmp/file.sql.gz")
         assert "Config" in kwargs
 
-    @patch("stores.s3.boto3")
-    def test_list(self, mock_boto):
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "prod/db/db-20260101-120000.sql.gz", "Size": 1024},
-                {"Key": "prod/db/db-20260102-120000.sql.gz", "Size": 2048},
-                {"Key": "prod/db/readme.txt", "Size": 100},  # should be skipped
-            ]},
-        ]
-
-        store = S3Store(bucket="mybucket")
-        backups = store.list("prod/db")
-
-        assert len(backups) == 2
-        assert backups[0].timestamp < backups[1].timestamp  # sorted oldest-first
-        assert backups[0].size == 1024
-        assert backups[1].size == 2048
-
-    @patch("stores.s3.boto3")
-    def test_list_skips_unparseable(self, mock_boto):
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "prod/db/not-a-backup.sql.gz", "Size": 100},
-            ]},
-        ]
-
+    def test_download_with_hash_hashes_while_writing(self, mock_client, tmp_path):
+        """s3transfer's in-order writes go to disk and into the hash in one pass."""
+        def fake_download_fileobj(bucket, key, fileobj, Config=None):
+            # Non-seekable targets are written sequentially by s3transfer.
+            assert not hasattr(fileobj, "seek")
+            assert Config is not None
+            fileobj.write(b"backup ")
+            fileobj.write(b"content")
+        mock_client.download_fileobj.side_effect = fake_download_fileobj
+
+        dest = tmp_path / "file.sql.gz"
         store = S3Store(bucket="mybucket")
-        assert store.list("prod/db") == []
+        digest = store.download_with_hash("prefix/file.sql.gz", str(dest))
 
-    @patch("stores.s3.boto3")
-    def test_list_multi_page(self, mock_boto):
-        """Paginator returns multiple pages."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
+        assert mock_client.download_fileobj.call_args[0][:2] == ("mybucket", "prefix/file.sql.gz")
+        assert dest.read_bytes() == b"backup content"
+        assert digest == hashlib.sha256(b"backup content").hexdigest()
 
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "prod/db/db-20260101-120000.sql.gz", "Size": 1024},
-            ]},
-            {"Contents": [
-                {"Key": "prod/db/db-20260102-120000.sql.gz", "Size": 2048},
-            ]},
-        ]
+    def test_get_bytes_reads_body(self, mock_client):
+        """get_bytes returns the object body without staging it on disk."""
+        body = Mock()
+        body.read.return_value = b"a" * 64
+        mock_client.get_object.return_value = {"Body": body}
 
         store = S3Store(bucket="mybucket")
-        backups = store.list("prod/db")
-        assert len(backups) == 2
-        assert backups[0].timestamp < backups[1].timestamp
-
-    @patch("stores.s3.boto3")
-    def test_list_empty_page(self, mock_boto):
-        """Page without 'Contents' key (empty prefix)."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [{}]  # no Contents
-
-        store = S3Store(bucket="mybucket")
-        assert store.list("prod/db") == []
-
-    @patch("stores.s3.boto3")
-    def test_list_file_at_root(self, mock_boto):
-        """File key with no '/' — filename is the key itself."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
+        assert store.get_bytes("prefix/file.sql.gz.sha256") == b"a" * 64
+        mock_client.get_object.assert_called_once_with(
+            Bucket="mybucket", Key="prefix/file.sql.gz.sha256"
+        )
+        mock_client.download_file.assert_not_called()
 
-        paginator = MagicMock()
+    @pytest.mark.parametrize("pages,prefix,expected", _S3_LIST_CASES)
+    def test_list(self, mock_client, pages, prefix, expected):
+        """Backups come back oldest-first as (filename, size) pairs."""
+        paginator = Mock()
         mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "db-20260101-120000.sql.gz", "Size": 500},
-            ]},
-        ]
+        paginator.paginate.return_value = pages
 
         store = S3Store(bucket="mybucket")
-        backups = store.list("")
-        assert len(backups) == 1
-        assert backups[0].filename == "db-20260101-120000.sql.gz"
-
-    @patch("stores.s3.boto3")
-    def test_delete(self, mock_boto):
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
+        backups = store.list(prefix)
+        assert [(b.filename, b.size) for b in backups] == expected
+        assert backups == sorted(backups, key=lambda b: b.timestamp)
 
+    def test_delete(self, mock_client):
         store = S3Store(bucket="mybucket")
         store.delete("prefix/file.sql.gz")
         mock_client.delete_object.assert_called_once_with(
             Bucket="mybucket", Key="prefix/file.sql.gz"
         )
 
-    @patch("stores.s3.boto3")
-    def test_list_mixed_extensions(self, mock_boto):
-        """S3 list recognizes all supported backup extensions."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "prod/db/db-20260101-120000.sql.gz", "Size": 1024},
-                {"Key": "prod/db/db-20260102-120000.sql.zst", "Size": 2048},
-                {"Key": "prod/db/db-20260103-120000.dump.lz4", "Size": 512},
-                {"Key": "prod/db/db-20260104-120000.dump", "Size": 4096},
-                {"Key": "prod/db/db-20260105-120000.sql", "Size": 8192},
-            ]},
-        ]
+    @patch("stores.s3._DELETE_BATCH_SIZE", 2)
+    def test_delete_many_batches_delete_objects(self, mock_client):
+        """Keys are deleted with DeleteObjects, at most one batch per request."""
+        mock_client.delete_objects.return_value = {}
 
         store = S3Store(bucket="mybucket")
-        backups = store.list("prod/db")
-        assert len(backups) == 5
-        assert backups[0].timestamp < backups[-1].timestamp
+        store.delete_many(["a", "a.sha256", "b"])
 
-    @patch("stores.s3.boto3")
-    def test_list_skips_unknown_extensions(self, mock_boto):
-        """S3 list skips files with unrecognized extensions like .tar.gz."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "prod/db/db-20260101-120000.tar.gz", "Size": 1024},
-                {"Key": "prod/db/db-20260102-120000.sql.gz", "Size": 2048},
-            ]},
+        batches = [
+            [o["Key"] for o in c[1]["Delete"]["Objects"]]
+            for c in mock_client.delete_objects.call_args_list
         ]
+        assert batches == [["a", "a.sha256"], ["b"]]
+        mock_client.delete_object.assert_not_called()
+
+    def test_delete_many_reports_errors(self, mock_client):
+        """Per-key errors raise unless the key is in allow_missing."""
+        mock_client.delete_objects.return_value = {
+            "Errors": [{"Key": "a.sha256", "Code": "AccessDenied", "Message": "Access Denied"}],
+        }
 
         store = S3Store(bucket="mybucket")
-        backups = store.list("prod/db")
-        assert len(backups) == 1
-        assert backups[0].filename == "db-20260102-120000.sql.gz"
+        store.delete_many(["a", "a.sha256"], allow_missing={"a.sha256"})
+        with pytest.raises(RuntimeError, match="a.sha256: Access Denied"):
+            store.delete_many(["a", "a.sha256"])
 
 
 class TestSSHStore:
-    def _store(self):
+    @pytest.fixture
+    def store(self):
         return SSHStore(host="backup.host", user="backupuser", path="/data/backups", port=2222)
 
-    @patch("stores.ssh.subprocess.run")
-    def test_upload(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0)
-        store = self._store()
+    def test_upload(self, store, mock_run):
         store.upload("/tmp/file.sql.gz", "prod/db/file.sql.gz")
 
         # Two calls: mkdir -p, then scp
@@ -239,100 +299,63 @@ class TestSSHStore:
         assert "scp" in scp_cmd[0]
         assert "-P" in scp_cmd  # uppercase P for scp port
 
-    @patch("stores.ssh.subprocess.run")
-    def test_download(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0)
-        store = self._store()
+    def test_download(self, store, mock_run):
         store.download("prod/db/file.sql.gz", "/tmp/file.sql.gz")
 
         assert mock_run.call_count == 1
         cmd = mock_run.call_args[0][0]
         assert "scp" in cmd[0]
 
-    @patch("stores.ssh.subprocess.run")
-    def test_list_parses_output(self, mock_run):
-        output = (
-            "1024\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
-            "2048\t/data/backups/prod/db/db-20260102-120000.sql.gz\n"
-        )
-        mock_run.return_value = MagicMock(returncode=0, stdout=output)
-
-        store = self._store()
-        backups = store.list("prod/db")
-
-        assert len(backups) == 2
-        assert backups[0].key == "prod/db/db-20260101-120000.sql.gz"
-        assert backups[0].size == 1024
-        assert backups[1].key == "prod/db/db-20260102-120000.sql.gz"
-        assert backups[1].size == 2048
-        assert backups[0].timestamp < backups[1].timestamp
-
-    @patch("stores.ssh.subprocess.run")
-    def test_list_empty(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="")
-        store = self._store()
-        assert store.list("prod/db") == []
-
-    @patch("stores.ssh.subprocess.run")
-    def test_list_malformed_lines_skipped(self, mock_run):
-        """Lines without a tab separator are silently skipped."""
-        output = (
-            "1024\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
-            "this line has no tab\n"
-            "2048\t/data/backups/prod/db/db-20260102-120000.sql.gz\n"
-        )
-        mock_run.return_value = MagicMock(returncode=0, stdout=output)
-        store = self._store()
+    @pytest.mark.parametrize("stdout,expected", _SSH_LIST_CASES)
+    def test_list(self, store, mock_run, stdout, expected):
+        """find output is parsed into backups, oldest-first."""
+        mock_run.return_value.stdout = stdout
         backups = store.list("prod/db")
-        assert len(backups) == 2
+        assert [(b.key, b.size) for b in backups] == expected
+        assert backups == sorted(backups, key=lambda b: b.timestamp)
 
-    @patch("stores.ssh.subprocess.run")
-    def test_list_unparseable_timestamp_skipped(self, mock_run):
-        """Files with unparseable timestamps are silently skipped."""
-        output = (
-            "1024\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
-            "500\t/data/backups/prod/db/random-file.sql.gz\n"
-        )
-        mock_run.return_value = MagicMock(returncode=0, stdout=output)
-        store = self._store()
-        backups = store.list("prod/db")
-        assert len(backups) == 1
-        assert backups[0].filename == "db-20260101-120000.sql.gz"
-
-    @patch("stores.ssh.subprocess.run")
-    def test_list_blank_lines_skipped(self, mock_run):
-        """Blank lines in output are skipped."""
-        output = "\n\n1024\t/data/backups/prod/db/db-20260101-120000.sql.gz\n\n"
-        mock_run.return_value = MagicMock(returncode=0, stdout=output)
-        store = self._store()
-        backups = store.list("prod/db")
-        assert len(backups) == 1
-
-    @patch("stores.ssh.subprocess.run")
-    def test_upload_constructs_correct_remote_path(self, mock_run):
+    def test_upload_constructs_correct_remote_path(self, store, mock_run):
         """Verify the remote path is base_path + remote_key."""
-        mock_run.return_value = MagicMock(returncode=0)
-        store = self._store()
         store.upload("/tmp/file.sql.gz", "prod/db/file.sql.gz")
 
         scp_cmd = mock_run.call_args_list[1][0][0]
         scp_cmd_str = " ".join(scp_cmd)
         assert "backupuser@backup.host:/data/backups/prod/db/file.sql.gz" in scp_cmd_str
 
-    @patch("stores.ssh.subprocess.run")
-    def test_delete(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0)
-        store = self._store()
+    def test_delete(self, store, mock_run):
         store.delete("prod/db/file.sql.gz")
 
         cmd = mock_run.call_args[0][0]
         assert "ssh" in cmd[0]
         assert "rm -f" in " ".join(cmd)
 
-    @patch("stores.ssh.subprocess.run")
-    def test_command_failure_raises(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1, stderr="Permission denied")
-        store = self._store()
+    def test_delete_many_single_command(self, store, mock_run):
+        """All keys are removed with one quoted rm -f over SSH."""
+        store.delete_many(["prod/db/a.sql.gz", "prod/db/a.sql.gz.sha256"])
+
+        mock_run.assert_called_once()
+        remote_cmd = mock_run.call_args[0][0][-1]
+        assert remote_cmd.startswith("rm -f -- ")
+        assert "/prod/db/a.sql.gz " in remote_cmd
+        assert remote_cmd.endswith("/prod/db/a.sql.gz.sha256")
+
+    def test_delete_many_optional_failure_ignored(self, store, mock_run):
+        """allow_missing keys go in their own rm, whose failure doesn't raise."""
+        def fake_run(cmd, **kwargs):
+            failed = cmd[-1].endswith(".sha256")
+            return subprocess.CompletedProcess(cmd, int(failed), stdout="", stderr="")
+        mock_run.side_effect = fake_run
+
+        store.delete_many(
+            ["prod/db/a.sql.gz", "prod/db/a.sql.gz.sha256"],
+            allow_missing={"prod/db/a.sql.gz.sha256"},
+        )
+        assert mock_run.call_count == 2
+        with pytest.raises(RuntimeError, match="Command failed"):
+            store.delete_many(["prod/db/a.sql.gz", "prod/db/a.sql.gz.sha256"])
+
+    def test_command_failure_raises(self, store, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess([], 1, stderr="Permission denied")
         with pytest.raises(RuntimeError, match="Command failed"):
             store.upload("/tmp/f", "k")
 
@@ -353,24 +376,9 @@ class TestSSHStore:
         opts = store._ssh_opts()
         assert "-i" not in opts
 
-    @patch("stores.ssh.subprocess.run")
-    def test_list_mixed_extensions(self, mock_run):
-        """SSH list parses mixed backup extensions."""
-        output = (
-            "1024\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
-            "2048\t/data/backups/prod/db/db-20260102-120000.dump.zst\n"
-            "512\t/data/backups/prod/db/db-20260103-120000.sql.lz4\n"
-        )
-        mock_run.return_value = MagicMock(returncode=0, stdout=output)
-        store = self._store()
-        backups = store.list("prod/db")
-        assert len(backups) == 3
-
-    @patch("stores.ssh.subprocess.run")
-    def test_list_find_includes_all_extensions(self, mock_run):
+    def test_list_find_includes_all_extensions(self, store, mock_run):
         """SSH find command includes patterns for all backup extensions."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="")
-        store = self._store()
+        mock_run.return_value.stdout = ""
         store.list("prod/db")
 
         cmd = mock_run.call_args[0][0]
@@ -430,8 +438,7 @@ class TestCreateStoreEdgeCases:
         with pytest.raises(ConfigError):
             create_store({})
 
-    @patch("stores.s3.boto3")
-    def test_s3_missing_bucket_raises_config_error(self, mock_boto):
+    def test_s3_missing_bucket_raises_config_error(self):
         """S3 create() without 'bucket' → ConfigError."""
         from stores.s3 import create
         with pytest.raises(ConfigError, match="bucket"):
@@ -457,7 +464,6 @@ class TestCreateStoreEdgeCases:
 
 
 class TestS3StoreEdgeCases:
-    @patch("stores.s3.boto3")
     def test_custom_endpoint(self, mock_boto):
         """S3Store with custom endpoint (e.g. R2/MinIO)."""
         store = S3Store(bucket="mybucket", endpoint="https://r2.example.com")
@@ -467,31 +473,23 @@ class TestS3StoreEdgeCases:
         kwargs = session_call.call_args[1]
         assert kwargs["endpoint_url"] == "https://r2.example.com"
 
-    @patch("stores.s3.boto3")
     def test_no_endpoint_omits_url(self, mock_boto):
         """S3Store without endpoint → no endpoint_url in client kwargs."""
         store = S3Store(bucket="mybucket")
         kwargs = mock_boto.session.Session.return_value.client.call_args[1]
         assert "endpoint_url" not in kwargs
 
-    @patch("stores.s3.boto3")
-    def test_list_object_without_size(self, mock_boto):
-        """S3 object metadata missing 'Size' → defaults to 0."""
-        mock_client = MagicMock()
-        mock_boto.session.Session.return_value.client.return_value = mock_client
-
-        paginator = MagicMock()
-        mock_client.get_paginator.return_value = paginator
-        paginator.paginate.return_value = [
-            {"Contents": [
-                {"Key": "prod/db/db-20260101-120000.sql.gz"},  # no Size
-            ]},
-        ]
-
-        store = S3Store(bucket="mybucket")
-        backups = store.list("prod/db")
-        assert len(backups) == 1
-        assert backups[0].size == 0
+    def test_client_shared_per_connection(self, mock_boto):
+        """Stores with the same connection settings reuse one boto3 client."""
+        mock_boto.session.Session.return_value.client.side_effect = lambda *a, **kw: Mock()
+        a = S3Store(bucket="one")
+        b = S3Store(bucket="two")
+        c = S3Store(bucket="one", endpoint="https://r2.example.com")
+        assert a._client is b._client
+        assert a._client is not c._client
+        assert mock_boto.session.Session.call_count == 2
+        config = mock_boto.session.Session.return_value.client.call_args[1]["config"]
+        assert config.max_pool_connections > 10  # shared by parallel jobs
 
 
 class TestSSHStoreEdgeCases:
@@ -502,19 +500,16 @@ class TestSSHStoreEdgeCases:
         opts = store._ssh_opts()
         assert "22" in opts
 
-    @patch("stores.ssh.subprocess.run")
     def test_command_failure_empty_stderr(self, mock_run):
         """Command fails with empty stderr → still raises."""
-        mock_run.return_value = MagicMock(returncode=1, stderr="")
+        mock_run.return_value = subprocess.CompletedProcess([], 1, stderr="")
         store = SSHStore(host="h", user="u", path="/p")
         with pytest.raises(RuntimeError, match="Command failed"):
             store.upload("/tmp/f", "k")
 
-    @patch("stores.ssh.subprocess.run")
     def test_list_non_numeric_size(self, mock_run):
         """Non-numeric size from find -printf → should raise ValueError."""
-        output = "NaN\t/data/backups/prod/db/db-20260101-120000.sql.gz\n"
-        mock_run.return_value = MagicMock(returncode=0, stdout=output)
+        mock_run.return_value.stdout = _SSH_NAN_SIZE
         store = SSHStore(host="h", user="u", path="/data/backups")
         with pytest.raises(ValueError):
             store.list("prod/db")
@@ -544,54 +539,23 @@ class TestSSHStoreEdgeCases:
 class TestSSHShellInjectionPrevention:
     """Security: paths interpolated into SSH commands must be shell-escaped."""
 
-    @patch("stores.ssh.subprocess.run")
-    def test_upload_mkdir_escapes_path(self, mock_run):
-        """mkdir -p command should escape the remote dir."""
-        mock_run.return_value = MagicMock(returncode=0)
-        store = SSHStore(host="h", user="u", path="/data")
-        store.upload("/tmp/f.sql.gz", "prefix/db/file.sql.gz")
-
-        mkdir_cmd = mock_run.call_args_list[0][0][0]
-        # The ssh command string (last arg) should contain a quoted path
-        ssh_cmd_str = mkdir_cmd[-1]
-        # shlex.quote wraps in single quotes for simple paths
-        assert "'/data/prefix/db'" in ssh_cmd_str or "/data/prefix/db" in ssh_cmd_str
-
-    @patch("stores.ssh.subprocess.run")
-    def test_upload_escapes_malicious_path(self, mock_run):
-        """Malicious remote_key with shell metacharacters should be escaped."""
-        mock_run.return_value = MagicMock(returncode=0)
-        store = SSHStore(host="h", user="u", path="/data")
-        store.upload("/tmp/f", "$(whoami)/file.sql.gz")
-
-        mkdir_cmd = mock_run.call_args_list[0][0][0]
-        ssh_cmd_str = mkdir_cmd[-1]
-        # The $(whoami) should be quoted, not executed
-        assert "$(whoami)" not in ssh_cmd_str or "'" in ssh_cmd_str
-
-    @patch("stores.ssh.subprocess.run")
-    def test_delete_escapes_path(self, mock_run):
-        """rm -f command should escape the remote path."""
-        mock_run.return_value = MagicMock(returncode=0)
-        store = SSHStore(host="h", user="u", path="/data")
-        store.delete("foo; rm -rf /")
-
-        cmd = mock_run.call_args[0][0]
-        ssh_cmd_str = cmd[-1]
-        # The malicious path should be quoted
-        assert "rm -f '/data/foo; rm -rf /'" in ssh_cmd_str
+    @pytest.fixture
+    def store(self):
+        return SSHStore(host="h", user="u", path="/data")
 
-    @patch("stores.ssh.subprocess.run")
-    def test_list_escapes_path(self, mock_run):
-        """find command should escape the remote dir."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="")
-        store = SSHStore(host="h", user="u", path="/data")
-        store.list("$(whoami)")
+    @pytest.mark.parametrize("action,args,expected", [
+        ("upload", ("/tmp/f.sql.gz", "prefix/db/file.sql.gz"), "mkdir -p /data/prefix/db"),
+        ("upload", ("/tmp/f", "$(whoami)/file.sql.gz"), "mkdir -p '/data/$(whoami)'"),
+        ("delete", ("foo; rm -rf /",), "rm -f -- '/data/foo; rm -rf /'"),
+        ("list", ("$(whoami)",), "find '/data/$(whoami)' "),
+        ("delete_many", (["foo; rm -rf /", "$(whoami)"],), "rm -f -- '/data/foo; rm -rf /' '/data/$(whoami)'"),
+    ], ids=["mkdir", "mkdir-malicious", "delete", "list", "delete-many"])
+    def test_remote_path_escaped(self, store, mock_run, action, args, expected):
+        """The first remote command quotes the path instead of letting the shell expand it."""
+        getattr(store, action)(*args)
 
-        cmd = mock_run.call_args[0][0]
-        ssh_cmd_str = cmd[-1]
-        # Should NOT contain unquoted $(whoami)
-        assert "'$(whoami)'" in ssh_cmd_str or "'/data/$(whoami)'" in ssh_cmd_str
+        ssh_cmd_str = mock_run.call_args_list[0][0][0][-1]
+        assert ssh_cmd_str.startswith(expected)
 
     def test_strict_host_key_checking_accept_new(self):
         """SSH should use accept-new, not 'no'."""
@@ -664,3 +628,66 @@ class TestStoreBaseClass:
             assert s is store
 
         assert closed == [True]
+
+    def test_download_with_hash_default(self, tmp_path):
+        """Default download_with_hash downloads without hashing, leaving that to the caller."""
+
+        class DummyStore(Store):
+            def upload(self, local_path, remote_key): pass
+            def download(self, remote_key, local_path):
+                with open(local_path, "wb") as f:
+                    f.write(b"payload")
+            def list(self, prefix): return []
+            def delete(self, remote_key): pass
+
+        dest = tmp_path / "k"
+        assert DummyStore().download_with_hash("k", str(dest)) is None
+        assert dest.read_bytes() == b"payload"
+
+    def test_get_bytes_default(self):
+        """Default get_bytes downloads through a temp file and returns its contents."""
+
+        class DummyStore(Store):
+            def upload(self, local_path, remote_key): pass
+            def download(self, remote_key, local_path):
+                with open(local_path, "wb") as f:
+                    f.write(remote_key.encode())
+            def list(self, prefix): return []
+            def delete(self, remote_key): pass
+
+        assert DummyStore().get_bytes("prod/db/x.sha256") == b"prod/db/x.sha256"
+
+    def test_delete_many_allow_missing(self):
+        """Default delete_many deletes each key; optional keys may fail."""
+        deleted = []
+
+        class DummyStore(Store):
+            def upload(self, local_path, remote_key): pass
+            def download(self, remote_key, local_path): pass
+            def list(self, prefix): return []
+            def delete(self, remote_key):
+                if remote_key.endswith(".sha256"):
+                    raise RuntimeError("not found")
+                deleted.append(remote_key)
+
+        store = DummyStore()
+        store.delete_many(["a", "a.sha256", "b"], allow_missing={"a.sha256"})
+        assert deleted == ["a", "b"]
+        with pytest.raises(RuntimeError, match="not found"):
+            store.delete_many(["a.sha256"])
+
+
+class TestBackupInfo:
+    def test_is_slotted_and_immutable(self):
+        """BackupInfo has no per-instance __dict__ and rejects field updates."""
+        import dataclasses
+
+        info = BackupInfo(
+            key="prod/db/db-20260101-120000.sql.gz",
+            filename="db-20260101-120000.sql.gz",
+            timestamp=datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            size=1024,
+        )
+        assert not hasattr(info, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            info.size = 0
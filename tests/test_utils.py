@@ -23,6 +23,13 @@ class TestSha256File:
         expected = hashlib.sha256(b"").hexdigest()
         assert sha256_file(str(f)) == expected
 
+    def test_multi_chunk_file_hash(self, tmp_path):
+        """Files larger than the read buffer hash the same as in-memory data."""
+        f = tmp_path / "large.bin"
+        content = bytes(range(256)) * 4099  # ~1 MiB, not buffer-aligned
+        f.write_bytes(content)
+        assert sha256_file(str(f)) == hashlib.sha256(content).hexdigest()
+
 
 class TestFormatSize:
     def test_bytes(self):
@@ -41,3 +48,10 @@ class TestFormatSize:
     def test_gigabytes(self):
         assert format_size(1024 ** 3) == "1.0 GB"
         assert format_size(2 * 1024 ** 3) == "2.0 GB"
+
+    def test_unit_boundaries(self):
+        assert format_size(1024 * 1024 - 1) == "1024.0 KB"
+        assert format_size(1024 ** 3 - 1) == "1024.0 MB"
+
+    def test_larger_than_gigabytes_stays_in_gb(self):
+        assert format_size(2 * 1024 ** 4) == "2048.0 GB"
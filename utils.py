@@ -3,24 +3,33 @@
 from __future__ import annotations
 
 import hashlib
+import mmap
 
 
 def sha256_file(path: str) -> str:
     """Compute the SHA256 hex digest of a file."""
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    with open(path, "rb", buffering=0) as f:
+        # Hash straight out of the page cache: no read() syscalls or copies
+        # into user-space buffers. Empty files (and filesystems that refuse
+        # mmap) fall back to file_digest's reusable readinto() buffer.
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        with mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return hashlib.sha256(mm).hexdigest()
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
 
 
 def format_size(size_bytes: int) -> str:
     """Format a byte count as a human-readable string (B, KB, MB, GB)."""
-    if size_bytes >= 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 ** 3):.1f} GB"
-    elif size_bytes >= 1024 * 1024:
-        return f"{size_bytes / (1024 ** 2):.1f} MB"
-    elif size_bytes >= 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    else:
+    # Each unit is a factor of 2**10, so the unit index falls straight out
+    # of the bit length instead of a chain of threshold comparisons.
+    unit = min(max((size_bytes.bit_length() - 1) // 10, 0), len(_SIZE_UNITS) - 1)
+    if unit == 0:
         return f"{size_bytes} B"
+    return f"{size_bytes / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"